@@ -15,10 +15,25 @@ IMPORTANT NOTES:
 - Aim for production-quality code, not just passing tests
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+_REQUIRED_COLUMNS = ("timestamp", "sensor", "value", "unit", "quality")
+# Resolution pandas gives datetime objects, as the simulator produces
+_TIMESTAMP_DTYPE = pd.Series([datetime(1970, 1, 1)]).dtype
+_QUALITY_FLAGS = ("GOOD", "BAD", "UNCERTAIN")
+_OUTLIER_MIN_READINGS = 100
+_ANOMALY_METHODS = ("zscore", "iqr", "rolling")
+_MIN_ANOMALY_READINGS = 3
+_ROLLING_WINDOW = 10
+_ROLLING_BLOCK = 65536
+
 
 def ingest_data(
     data_batches: List[pd.DataFrame],
@@ -63,10 +78,157 @@ def ingest_data(
     - Consider filtering by quality flags
     - Document your data cleaning strategy in NOTES.md
     """
-    # TODO: Implement this function
-    raise NotImplementedError(
-        "ingest_data() must be implemented by the candidate"
+    if not data_batches:
+        raise ValueError("data_batches must contain at least one DataFrame")
+
+    valid_data_batches = []
+    for i, batch in enumerate(data_batches):
+        if not isinstance(batch, pd.DataFrame):
+            raise ValueError(
+                f"Batch {i} is {type(batch).__name__}, expected a pandas DataFrame"
+            )
+        if batch.empty:
+            continue
+        missing = [col for col in _REQUIRED_COLUMNS if col not in batch.columns]
+        if missing:
+            raise ValueError(f"Batch {i} is missing required columns: {missing}")
+        valid_data_batches.append(batch)
+
+    if not valid_data_batches:
+        # Every batch was empty (e.g. all reads dropped out). Run an empty frame
+        # through the same steps so the dtypes match any other empty result
+        valid_data_batches = [
+            pd.DataFrame({
+                "timestamp": pd.Series(dtype=_TIMESTAMP_DTYPE),
+                "sensor": pd.Series(dtype=str),
+                "value": pd.Series(dtype=float),
+                "unit": pd.Series(dtype=str),
+                "quality": pd.Series(dtype=str),
+            })
+        ]
+
+    if len(valid_data_batches) == 1:
+        # Nothing to consolidate, so skip concat's block-by-block copy
+        df = valid_data_batches[0].reset_index(drop=True)
+    else:
+        df = pd.concat(valid_data_batches, ignore_index=True, sort=False)
+    df["timestamp"] = _parse_timestamps(df["timestamp"])
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+
+    if validate:
+        # A reading without a timestamp or sensor cannot be placed anywhere
+        df = df.dropna(subset=["timestamp", "sensor"])
+        # A sensor reports at most once per timestamp, so the key identifies the
+        # reading; the latest batch wins when a re-sent reading differs
+        df = df.drop_duplicates(subset=["timestamp", "sensor"], keep="last")
+        df["quality"] = _normalize_quality(df["quality"])
+        is_bad = df["quality"].cat.codes.to_numpy() == _QUALITY_FLAGS.index("BAD")
+        if len(df) and logger.isEnabledFor(logging.INFO):
+            bad_count = np.count_nonzero(is_bad)
+            logger.info(
+                "Dropped %d of %d readings (%.1f%%) with BAD quality",
+                bad_count,
+                len(df),
+                100.0 * bad_count / len(df),
+            )
+        keep = ~is_bad
+    else:
+        keep = np.ones(len(df), dtype=bool)
+
+    # Filter, sort and renumber with a single gather instead of three copies
+    positions = np.flatnonzero(keep)
+    order = np.argsort(df["timestamp"].values[positions], kind="stable")
+    df = df.take(positions[order]).reset_index(drop=True)
+    df["value"] = _to_single_precision(df["value"])
+    # A few sensor names repeated over every row: integer codes make the
+    # per-sensor filters and groupbys downstream compare ints, not strings
+    df["sensor"] = df["sensor"].astype("category")
+    df["is_outlier"] = _flag_outliers(df)
+    return df
+
+
+def _parse_timestamps(timestamps: pd.Series) -> pd.Series:
+    """
+    Convert raw timestamps to naive UTC datetimes, coercing unparseable values to NaT.
+
+    Timezone-aware values are converted to UTC and naive ones are taken as UTC,
+    so batches mixing naive timestamps and different offsets share one timeline.
+    Strings are parsed with the ISO 8601 fast path first; only values it rejects
+    are re-parsed with per-element format inference.
+    """
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+            return timestamps.dt.tz_convert(None)
+        return timestamps
+    parsed = pd.to_datetime(
+        timestamps, errors="coerce", format="ISO8601", utc=True, cache=True
     )
+    retry = parsed.isna() & timestamps.notna()
+    if retry.any():
+        fallback = pd.to_datetime(timestamps[retry], errors="coerce", format="mixed", utc=True)
+        parsed = parsed.mask(retry, fallback)
+    return parsed.dt.tz_convert(None)
+
+
+def _normalize_quality(quality: pd.Series) -> pd.Categorical:
+    """
+    Map raw quality flags onto the GOOD/BAD/UNCERTAIN categorical.
+
+    Flags are upper-cased once per distinct value rather than once per row.
+    Missing or unrecognised flags become UNCERTAIN.
+    """
+    codes, uniques = pd.factorize(quality)
+    flags = pd.Index(uniques.astype(str)).str.strip().str.upper()
+    lookup = pd.Index(_QUALITY_FLAGS).get_indexer(flags)
+    uncertain = _QUALITY_FLAGS.index("UNCERTAIN")
+    # Trailing entry catches the -1 code factorize gives missing values
+    lookup = np.append(np.where(lookup == -1, uncertain, lookup), uncertain)
+    return pd.Categorical.from_codes(lookup[codes], categories=_QUALITY_FLAGS)
+
+
+def _to_single_precision(values: pd.Series) -> np.ndarray:
+    """
+    Store readings as float32, saturating values beyond its range.
+
+    Single precision keeps about 7 significant digits (65.1 is stored as
+    65.0999985), which is within sensor resolution, and halves the bytes every
+    downstream scan reads. Finite readings beyond +/-3.4e38 are saturated at the
+    float32 limit instead of overflowing to inf, so they stay finite and extreme.
+    """
+    limit = np.finfo(np.float32).max
+    values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    out_of_range = np.isfinite(values) & (np.abs(values) > limit)
+    if out_of_range.any():
+        values = np.where(out_of_range, np.copysign(limit, values), values)
+    return values.astype(np.float32)
+
+
+def _flag_outliers(df: pd.DataFrame) -> np.ndarray:
+    """
+    Flag readings outside the 1st-99th percentile band of their own sensor.
+
+    Bands are computed per sensor because sensors report in different units,
+    from finite readings only, so +/-inf readings fall outside the band and are
+    flagged. NaN values are never flagged, and neither are sensors with fewer than
+    _OUTLIER_MIN_READINGS readings, where a 1%/99% band is meaningless.
+    """
+    is_outlier = np.zeros(len(df), dtype=bool)
+    if len(df) < _OUTLIER_MIN_READINGS:
+        # Small batches cannot have a large enough sensor; skip the grouping
+        return is_outlier
+
+    vals = df["value"].to_numpy()
+    for positions in df.groupby("sensor", sort=False, observed=True).indices.values():
+        if len(positions) < _OUTLIER_MIN_READINGS:
+            continue
+        sensor_vals = vals[positions]
+        finite = sensor_vals[np.isfinite(sensor_vals)]
+        if finite.size == 0:
+            continue
+        # Both percentiles from a single selection pass over the sensor's values
+        lo, hi = np.quantile(finite, [0.01, 0.99])
+        is_outlier[positions] = (sensor_vals < lo) | (sensor_vals > hi)
+    return is_outlier
 
 
 def detect_anomalies(
@@ -116,12 +278,233 @@ def detect_anomalies(
     - Think about edge cases: what if all data is anomalous? None is?
     - Document your approach and limitations in NOTES.md
     """
-    # TODO: Implement this function
-    raise NotImplementedError(
-        "detect_anomalies() must be implemented by the candidate"
+    _check_anomaly_inputs(data, method)
+    # Positions, as _sensor_positions provides, so the gathers and write-back
+    # index straight into the arrays; an empty result doubles as the existence
+    # check without a separate unique() scan
+    rows = np.flatnonzero(_sensor_mask(data["sensor"], sensor_name))
+    if rows.size == 0:
+        raise ValueError(f"Sensor '{sensor_name}' not found in data")
+
+    scores = _score_sensor(data, rows, sensor_name, method)
+    return _with_anomaly_columns(data, [(rows, scores)], method, threshold)
+
+
+def detect_anomalies_all(
+    data: pd.DataFrame,
+    method: str = "zscore",
+    threshold: float = 3.0,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Detect anomalies in every sensor at once, scoring sensors in parallel.
+
+    Equivalent to calling detect_anomalies() for each sensor and combining the
+    results, but the data is grouped by sensor only once and the sensors are
+    scored concurrently on a thread pool (numpy releases the GIL in the
+    reductions that dominate scoring).
+
+    Args:
+        data: DataFrame from ingest_data() containing sensor readings
+        method: Detection method - "zscore", "iqr", or "rolling"
+        threshold: Sensitivity parameter (interpretation depends on method)
+        max_workers: Thread pool size; None uses the ThreadPoolExecutor default
+
+    Returns:
+        DataFrame with original data plus is_anomaly, anomaly_score and
+        detection_method columns, as from detect_anomalies(). Sensors with too
+        few valid readings are left unscored (detection_method "none").
+
+    Raises:
+        ValueError: If method not supported or required columns are missing
+
+    Example:
+        >>> anomalies = detect_anomalies_all(clean_data, method="iqr", threshold=1.5)
+        >>> print(anomalies.groupby("sensor", observed=True)["is_anomaly"].sum())
+    """
+    _check_anomaly_inputs(data, method)
+    sensor_index = _sensor_positions(data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            (rows, pool.submit(_score_sensor, data, rows, sensor_name, method))
+            for sensor_name, rows in sensor_index.items()
+        ]
+        scored = []
+        for rows, future in futures:
+            try:
+                scored.append((rows, future.result()))
+            except _InsufficientReadingsError:
+                # Too few valid readings: leave this sensor unscored
+                continue
+
+    return _with_anomaly_columns(data, scored, method, threshold)
+
+
+class _InsufficientReadingsError(ValueError):
+    """A sensor has too few valid readings for anomaly scoring."""
+
+
+def _check_anomaly_inputs(data: pd.DataFrame, method: str) -> None:
+    """Raise ValueError for an unsupported method or missing columns."""
+    if method not in _ANOMALY_METHODS:
+        raise ValueError(
+            f"Unsupported method '{method}', expected one of {list(_ANOMALY_METHODS)}"
+        )
+    missing = [col for col in ("timestamp", "sensor", "value") if col not in data.columns]
+    if missing:
+        raise ValueError(f"Data is missing required columns: {missing}")
+
+
+def _score_sensor(
+    data: pd.DataFrame,
+    rows: np.ndarray,
+    sensor_name: str,
+    method: str,
+) -> np.ndarray:
+    """
+    Anomaly scores for the readings at the given row positions.
+
+    Raises:
+        _InsufficientReadingsError: If the sensor has too few valid readings
+    """
+    # Work on the sensor's rows in place of a filtered copy, so results can be
+    # written straight back by position instead of joined back on the index.
+    # Only the gathered readings are widened to float64, so the sums behind the
+    # scores keep full precision
+    values = data["value"].to_numpy().take(rows).astype(np.float64)
+    # Statistics come from finite readings only: one inf would otherwise turn
+    # the mean and spread into inf/NaN and switch detection off for the sensor
+    valid_values = values[np.isfinite(values)]
+    if valid_values.size < _MIN_ANOMALY_READINGS:
+        raise _InsufficientReadingsError(
+            f"Sensor '{sensor_name}' has {valid_values.size} valid readings, "
+            f"at least {_MIN_ANOMALY_READINGS} are required for anomaly detection"
+        )
+
+    if method == "zscore":
+        # The variance is a dot product of the centred values, which replaces
+        # the second mean and the square/sum temporaries inside np.std
+        mean = valid_values.mean()
+        centred = np.subtract(valid_values, mean)
+        std = np.sqrt(np.dot(centred, centred) / (valid_values.size - 1))
+        if std > 0:
+            # One output buffer for the whole score instead of a temporary per step
+            scores = np.subtract(values, mean)
+            scores /= std
+            np.abs(scores, out=scores)
+        else:
+            # Constant signal: nothing deviates from the mean
+            scores = np.zeros_like(values)
+    elif method == "iqr":
+        # Both quartiles from one selection pass instead of two pandas sorts
+        q1, q3 = np.quantile(valid_values, [0.25, 0.75])
+        iqr = q3 - q1
+        if iqr > 0:
+            # Score is the distance outside the [q1, q3] box, in IQR units, taken
+            # as |value - midpoint| - half-width and built up in a single buffer
+            scores = np.subtract(values, (q1 + q3) / 2)
+            np.abs(scores, out=scores)
+            scores -= iqr / 2
+            np.maximum(scores, 0.0, out=scores)
+            scores /= iqr
+        else:
+            # Zero-width box (stuck or quantized sensor): any reading off the
+            # box is infinitely far outside it, the rest are not anomalous
+            scores = np.where((values < q1) | (values > q3), np.inf, 0.0)
+    else:
+        # Compare each reading to the statistics of the readings before it
+        order = np.argsort(data["timestamp"].to_numpy().take(rows), kind="stable")
+        scores = np.empty_like(values)
+        scores[order] = _rolling_zscores(values[order], _ROLLING_WINDOW)
+
+    scores[np.isnan(scores)] = 0.0
+    # An infinite reading is as anomalous as a reading can be, whatever the method
+    scores[np.isinf(values)] = np.inf
+    return scores
+
+
+def _with_anomaly_columns(
+    data: pd.DataFrame,
+    scored: List[Tuple[np.ndarray, np.ndarray]],
+    method: str,
+    threshold: float,
+) -> pd.DataFrame:
+    """Attach anomaly columns, filled from (row positions, scores) pairs."""
+    n = len(data)
+    is_anomaly = np.zeros(n, dtype=bool)
+    anomaly_score = np.zeros(n)
+    detection_method = np.full(n, "none", dtype=object)
+    for rows, scores in scored:
+        is_anomaly[rows] = scores > threshold
+        anomaly_score[rows] = scores
+        detection_method[rows] = method
+
+    # assign() overwrites the columns from any previous detection run
+    return data.assign(
+        is_anomaly=is_anomaly,
+        anomaly_score=anomaly_score,
+        detection_method=detection_method,
     )
 
 
+def _sensor_mask(sensors: pd.Series, sensor_name: str) -> np.ndarray:
+    """Boolean mask of the rows belonging to sensor_name."""
+    if isinstance(sensors.dtype, pd.CategoricalDtype):
+        categories = sensors.cat.categories
+        if sensor_name not in categories:
+            return np.zeros(len(sensors), dtype=bool)
+        return sensors.cat.codes.to_numpy() == categories.get_loc(sensor_name)
+    return sensors.to_numpy() == sensor_name
+
+
+def _sensor_positions(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Row positions of each sensor's readings, built in one grouping pass."""
+    return data.groupby("sensor", sort=False, observed=True).indices
+
+
+def _rolling_zscores(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Absolute z-score of each reading against the ``window`` readings before it.
+
+    Each reading's trailing window is a strided view, not a copy, and the
+    windows are scored a block at a time so the temporaries stay bounded. Every
+    window is centred on its own mean before the variance is taken, so a quiet
+    window far from the sensor's overall level keeps full precision. NaN and
+    infinite readings are left out of the windows; a score needs at least two
+    valid prior readings and a non-zero spread, matching pandas'
+    rolling(window, min_periods=2) on finite data.
+    """
+    # NaN padding gives the first readings short windows; row i of the view
+    # is values[i - window:i]
+    padded = np.concatenate((np.full(window, np.nan), values))
+    windows = np.lib.stride_tricks.sliding_window_view(padded[:-1], window)
+
+    scores = np.empty_like(values)
+    for start in range(0, len(values), _ROLLING_BLOCK):
+        stop = start + _ROLLING_BLOCK
+        scores[start:stop] = _window_zscores(values[start:stop], windows[start:stop])
+    return scores
+
+
+def _window_zscores(current: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """Absolute z-score of each current reading against its row of windows."""
+    valid = np.isfinite(windows)
+    n = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(valid, windows, 0.0).sum(axis=1) / n
+        deviations = np.where(valid, windows - mean[:, None], 0.0)
+        var = np.einsum("ij,ij->i", deviations, deviations) / (n - 1)
+        # Identical readings have exactly zero spread, not round-off noise
+        spread = np.where(valid, windows, -np.inf).max(axis=1) - np.where(
+            valid, windows, np.inf
+        ).min(axis=1)
+        var[spread == 0] = 0.0
+        scores = np.abs(current - mean) / np.sqrt(var)
+    scores[(n < 2) | ~(var > 0) | np.isnan(current)] = 0.0
+    return scores
+
+
 def summarize_metrics(
     data: pd.DataFrame,
     group_by: Optional[str] = "sensor",
@@ -181,7 +564,54 @@ def summarize_metrics(
     - Ensure robust handling of edge cases (all nulls, single value, etc.)
     - Document your metric choices in NOTES.md
     """
-    # TODO: Implement this function
-    raise NotImplementedError(
-        "summarize_metrics() must be implemented by the candidate"
-    )
+    if not isinstance(data, pd.DataFrame) or data.empty:
+        raise ValueError("data must be a non-empty DataFrame")
+    if group_by is not None and group_by not in data.columns:
+        raise ValueError(f"group_by column '{group_by}' not found in data")
+    required = ["value"] if time_window is None else ["value", "timestamp"]
+    missing = [col for col in required if col not in data.columns]
+    if missing:
+        raise ValueError(f"Data is missing required columns: {missing}")
+
+    # Only the columns the metrics need, with the flags pre-computed as booleans
+    # so every metric comes out of one vectorized groupby-aggregate
+    value = pd.to_numeric(data["value"], errors="coerce")
+    frame = pd.DataFrame({
+        "key": data[group_by] if group_by is not None else "all",
+        "value": value,
+        "is_null": value.isna(),
+    })
+    aggregations = {
+        "mean": ("value", "mean"),
+        "std": ("value", "std"),
+        "min": ("value", "min"),
+        "max": ("value", "max"),
+        "count": ("value", "count"),
+        "null_count": ("is_null", "sum"),
+    }
+    if "quality" in data.columns:
+        frame["is_good"] = data["quality"] == "GOOD"
+        aggregations["good_quality_pct"] = ("is_good", "mean")
+    if "is_anomaly" in data.columns:
+        frame["is_anomaly"] = data["is_anomaly"].astype(bool)
+        aggregations["anomaly_rate"] = ("is_anomaly", "mean")
+
+    groupers = ["key"]
+    if time_window is not None:
+        frame["timestamp"] = data["timestamp"]
+        groupers.append(pd.Grouper(key="timestamp", freq=time_window))
+
+    stats = frame.groupby(groupers, observed=True, sort=False).agg(**aggregations)
+    # A single reading has no spread rather than an undefined one
+    stats.loc[stats["count"] == 1, "std"] = 0.0
+    if "good_quality_pct" in stats.columns:
+        stats["good_quality_pct"] *= 100.0
+
+    metrics = stats.to_dict(orient="index")
+    if time_window is None:
+        return metrics
+
+    windowed: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for (key, window_start), window_metrics in metrics.items():
+        windowed.setdefault(key, {})[window_start.isoformat()] = window_metrics
+    return windowed
@@ -0,0 +1,367 @@
+"""
+Additional tests for the data processing implementation.
+
+These complement tests/test_exposed.py with checks on implementation details
+(derived columns, edge cases) that the exposed tests do not cover.
+
+Run with: pytest tests/test_data_processing.py -v
+"""
+
+import logging
+import pytest
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_processing import (
+    ingest_data,
+    detect_anomalies,
+    detect_anomalies_all,
+    summarize_metrics,
+    _rolling_zscores,
+    _score_sensor,
+    _sensor_positions,
+    _with_anomaly_columns,
+)
+
+
+def make_readings(values, sensor="temperature", quality="GOOD"):
+    """Build a single-sensor batch with one reading per second."""
+    start = datetime(2024, 1, 1)
+    return pd.DataFrame({
+        "timestamp": [start + timedelta(seconds=i) for i in range(len(values))],
+        "sensor": [sensor] * len(values),
+        "value": values,
+        "unit": ["°C"] * len(values),
+        "quality": [quality] * len(values),
+    })
+
+
+class TestIngestData:
+    """Tests for ingest_data() beyond the exposed suite."""
+
+    def test_flags_outliers_per_sensor(self):
+        """Outlier bands should be computed independently for each sensor."""
+        temperature = make_readings([65.0] * 199 + [500.0], sensor="temperature")
+        vibration = make_readings(list(np.linspace(0.4, 0.6, 200)), sensor="vibration")
+        result = ingest_data([temperature, vibration])
+
+        temp_rows = result[result["sensor"] == "temperature"]
+        assert temp_rows.loc[temp_rows["value"] == 500.0, "is_outlier"].all()
+        assert result["is_outlier"].dtype == bool
+
+    def test_infinite_readings_are_outliers(self):
+        """Infinite readings should not poison the band and should be flagged."""
+        values = list(np.linspace(60.0, 70.0, 195)) + [np.inf] * 5
+        result = ingest_data([make_readings(values)])
+        assert result["is_outlier"].iloc[-5:].all()
+        assert result["is_outlier"].iloc[194]
+
+    def test_small_batches_have_no_outliers(self):
+        """Percentile bands are not applied to sensors with too few readings."""
+        result = ingest_data([make_readings([65.0] * 20 + [500.0])])
+        assert not result["is_outlier"].any()
+
+    def test_parses_string_timestamps(self):
+        """ISO and non-ISO timestamp strings parse; garbage rows are dropped."""
+        df = make_readings([1.0, 2.0, 3.0, 4.0])
+        df["timestamp"] = ["2024-01-01T00:00:02", "2024-01-01 00:00:01", "01/01/2024 00:00:03", "n/a"]
+        result = ingest_data([df])
+        assert pd.api.types.is_datetime64_any_dtype(result["timestamp"])
+        assert result["value"].tolist() == [2.0, 1.0, 3.0]
+
+    def test_mixed_offset_and_naive_strings_share_one_timeline(self):
+        """Offset, differing-offset and naive strings should parse to naive UTC."""
+        df = make_readings([1.0, 2.0, 3.0, 4.0])
+        df["timestamp"] = [
+            "2024-01-01T00:00:00+01:00",
+            "2024-01-01T00:00:01+02:00",
+            "01/01/2024 00:00:03",
+            "2024-01-01T00:00:02",
+        ]
+        result = ingest_data([df])
+        assert result["timestamp"].dt.tz is None
+        assert result["timestamp"].tolist() == [
+            pd.Timestamp("2023-12-31 22:00:01"),
+            pd.Timestamp("2023-12-31 23:00:00"),
+            pd.Timestamp("2024-01-01 00:00:02"),
+            pd.Timestamp("2024-01-01 00:00:03"),
+        ]
+
+    def test_naive_and_aware_batches_combine(self):
+        """Naive and tz-aware datetime batches should ingest onto one UTC timeline."""
+        naive = make_readings([1.0, 2.0])
+        aware = make_readings([3.0])
+        aware["timestamp"] = aware["timestamp"].dt.tz_localize("Europe/Berlin")
+        result = ingest_data([naive, aware])
+        assert result["timestamp"].dt.tz is None
+        assert result["value"].tolist() == [3.0, 1.0, 2.0]
+
+    def test_duplicate_key_keeps_latest_reading(self):
+        """Readings re-sent for the same timestamp and sensor keep the last value."""
+        first = make_readings([65.0, 66.0])
+        resent = make_readings([65.5])
+        result = ingest_data([first, resent])
+        assert len(result) == 2
+        assert result["value"].tolist() == [65.5, 66.0]
+
+    def test_normalizes_quality_flags(self):
+        """Quality flags should be upper-cased, with missing/unknown as UNCERTAIN."""
+        df = make_readings([1.0, 2.0, 3.0, 4.0])
+        df["quality"] = ["good", " Uncertain", None, "weird"]
+        result = ingest_data([df])
+        assert result["quality"].tolist() == ["GOOD", "UNCERTAIN", "UNCERTAIN", "UNCERTAIN"]
+
+    def test_logs_dropped_bad_readings(self, caplog, capsys):
+        """The BAD quality count should be logged at INFO, never printed."""
+        df = make_readings([1.0, 2.0, 3.0, 4.0])
+        df["quality"] = ["GOOD", "BAD", "GOOD", "GOOD"]
+
+        with caplog.at_level(logging.INFO, logger="src.data_processing"):
+            result = ingest_data([df])
+
+        assert "Dropped 1 of 4 readings" in caplog.text
+        assert capsys.readouterr().out == ""
+        assert len(result) == 3
+
+    def test_values_are_single_precision(self):
+        """Ingested values should be stored as float32."""
+        result = ingest_data([make_readings([65.0, 66.5])])
+        assert result["value"].dtype == np.float32
+
+    def test_out_of_range_values_saturate_instead_of_overflowing(self):
+        """Readings beyond float32 range should stay finite and still be detectable."""
+        rng = np.random.default_rng(5)
+        values = list(65.0 + rng.normal(0, 0.5, 50)) + [120.0, 1e39, -1e39]
+        clean_data = ingest_data([make_readings(values)])
+
+        stored = clean_data["value"].to_numpy()
+        assert np.isfinite(stored).all()
+        assert stored[-2] == np.finfo(np.float32).max
+        assert stored[-1] == -np.finfo(np.float32).max
+
+        result = detect_anomalies(clean_data, "temperature", method="zscore", threshold=1.0)
+        assert result["is_anomaly"].iloc[-2:].all()
+        metrics = summarize_metrics(clean_data)["temperature"]
+        assert np.isfinite(metrics["std"])
+
+    def test_sensor_is_categorical(self):
+        """Sensor names should be stored as a categorical column."""
+        result = ingest_data([make_readings([1.0]), make_readings([2.0], sensor="pressure")])
+        assert isinstance(result["sensor"].dtype, pd.CategoricalDtype)
+        assert set(result["sensor"].cat.categories) == {"temperature", "pressure"}
+
+    def test_all_empty_batches_returns_empty_frame(self):
+        """Batches that are all empty should yield an empty, well-formed frame."""
+        result = ingest_data([pd.DataFrame(), pd.DataFrame()])
+        assert result.empty
+        assert {"timestamp", "sensor", "value", "is_outlier"} <= set(result.columns)
+
+    def test_empty_result_dtypes_do_not_depend_on_cause(self):
+        """All-empty batches should give the same dtypes as an all-BAD batch."""
+        all_empty = ingest_data([pd.DataFrame()])
+        all_bad = ingest_data([make_readings([1.0, 2.0], quality="BAD")])
+        assert all_empty.empty and all_bad.empty
+        pd.testing.assert_series_equal(all_empty.dtypes, all_bad.dtypes)
+
+    def test_non_dataframe_batch_raises_error(self):
+        """Invalid batch types should raise ValueError."""
+        with pytest.raises(ValueError):
+            ingest_data([make_readings([1.0]), "not a frame"])
+
+
+class TestDetectAnomalies:
+    """Tests for detect_anomalies() beyond the exposed suite."""
+
+    @pytest.mark.parametrize("method", ["zscore", "iqr", "rolling"])
+    def test_flags_spike_with_each_method(self, method):
+        """Every method should flag an obvious spike and only annotate the sensor."""
+        rng = np.random.default_rng(0)
+        temperature = make_readings(list(65.0 + rng.normal(0, 0.5, 40)) + [120.0] + [65.0] * 5)
+        pressure = make_readings([101.3] * 20, sensor="pressure")
+        clean_data = ingest_data([temperature, pressure])
+
+        result = detect_anomalies(clean_data, "temperature", method=method, threshold=3.0)
+
+        assert len(result) == len(clean_data)
+        assert result.loc[result["value"] == 120.0, "is_anomaly"].all()
+        pressure_rows = result[result["sensor"] == "pressure"]
+        assert not pressure_rows["is_anomaly"].any()
+        assert (pressure_rows["detection_method"] == "none").all()
+
+    def test_rolling_scores_match_pandas_rolling(self):
+        """Rolling scores should match pandas' trailing rolling mean/std, NaNs included."""
+        rng = np.random.default_rng(2)
+        values = np.concatenate([rng.normal(0, 1, 300), rng.normal(50, 0.5, 300)])
+        values[rng.random(600) < 0.05] = np.nan
+        values[[100, 450]] += 8.0
+
+        series = pd.Series(values)
+        rolling = series.rolling(10, min_periods=2)
+        rolling_mean = rolling.mean().shift(1)
+        rolling_std = rolling.std().shift(1)
+        expected = ((series - rolling_mean) / rolling_std.where(rolling_std > 0)).abs()
+        expected = expected.fillna(0.0).to_numpy()
+
+        np.testing.assert_allclose(_rolling_zscores(values, 10), expected, rtol=1e-9, atol=1e-9)
+
+    def test_rolling_flags_spike_after_level_shift(self):
+        """A quiet window far from the sensor's overall level should still score."""
+        rng = np.random.default_rng(3)
+        values = np.concatenate([rng.normal(0, 1e-3, 500), rng.normal(2000, 1e-3, 500)])
+        values[750] += 1.0
+        clean_data = ingest_data([make_readings(list(values))])
+
+        result = detect_anomalies(clean_data, "temperature", method="rolling", threshold=3.0)
+
+        assert result["is_anomaly"].iloc[750]
+        assert result["anomaly_score"].iloc[750] > 100
+
+    def test_sensor_positions_path_matches_detect_anomalies(self):
+        """Scoring from a precomputed sensor index should match a plain call."""
+        temperature = make_readings([65.0] * 10 + [500.0])
+        pressure = make_readings([101.3, 101.1, 101.4], sensor="pressure")
+        clean_data = ingest_data([temperature, pressure])
+        rows = _sensor_positions(clean_data)["temperature"]
+
+        scores = _score_sensor(clean_data, rows, "temperature", "zscore")
+        result = _with_anomaly_columns(clean_data, [(rows, scores)], "zscore", 2.0)
+
+        expected = detect_anomalies(clean_data, "temperature", threshold=2.0)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_accepts_plain_string_sensor_column(self):
+        """Frames not produced by ingest_data may carry sensors as plain strings."""
+        clean_data = ingest_data([make_readings([65.0] * 10 + [500.0])])
+        plain = clean_data.assign(sensor=clean_data["sensor"].astype(str))
+        expected = detect_anomalies(clean_data, "temperature", threshold=2.0)
+        result = detect_anomalies(plain, "temperature", threshold=2.0)
+        assert result["is_anomaly"].tolist() == expected["is_anomaly"].tolist()
+
+    def test_constant_signal_has_no_anomalies(self):
+        """Zero variance should not produce division errors or anomalies."""
+        clean_data = ingest_data([make_readings([65.0] * 20)])
+        result = detect_anomalies(clean_data, "temperature", method="zscore")
+        assert not result["is_anomaly"].any()
+        assert (result["anomaly_score"] == 0.0).all()
+
+    @pytest.mark.parametrize("method", ["zscore", "iqr", "rolling"])
+    def test_infinite_reading_does_not_disable_detection(self, method):
+        """An inf reading should be flagged itself and leave the rest scored."""
+        rng = np.random.default_rng(4)
+        values = list(65.0 + rng.normal(0, 0.5, 40))
+        values[10] = np.inf
+        values[30] = 120.0
+        clean_data = ingest_data([make_readings(values)])
+
+        result = detect_anomalies(clean_data, "temperature", method=method, threshold=3.0)
+
+        assert np.isinf(result["anomaly_score"].iloc[10])
+        assert result["is_anomaly"].iloc[10]
+        assert result["is_anomaly"].iloc[30]
+        assert result["anomaly_score"].iloc[11:20].gt(0).any()
+
+    def test_insufficient_data_raises_error(self):
+        """Too few valid readings should raise ValueError."""
+        clean_data = ingest_data([make_readings([65.0, np.nan])])
+        with pytest.raises(ValueError):
+            detect_anomalies(clean_data, "temperature")
+
+    def test_rerun_replaces_previous_columns(self):
+        """Running detection on its own output should not duplicate columns."""
+        clean_data = ingest_data([make_readings([65.0] * 10 + [500.0])])
+        first = detect_anomalies(clean_data, "temperature", method="zscore", threshold=2.0)
+        second = detect_anomalies(first, "temperature", method="iqr")
+        assert list(second.columns) == list(first.columns)
+        assert (second["detection_method"] == "iqr").all()
+
+    def test_iqr_flags_spike_on_stuck_sensor(self):
+        """A zero-width IQR box should still flag readings off the box."""
+        clean_data = ingest_data([make_readings([65.0] * 10 + [500.0])])
+        result = detect_anomalies(clean_data, "temperature", method="iqr")
+        assert result["is_anomaly"].tolist() == [False] * 10 + [True]
+        assert np.isinf(result["anomaly_score"].iloc[-1])
+        assert (result["anomaly_score"].iloc[:10] == 0.0).all()
+
+
+class TestDetectAnomaliesAll:
+    """Tests for detect_anomalies_all()."""
+
+    def test_matches_per_sensor_detection(self):
+        """Scoring all sensors at once should match per-sensor calls."""
+        rng = np.random.default_rng(1)
+        temperature = make_readings(list(65.0 + rng.normal(0, 0.5, 30)) + [90.0])
+        pressure = make_readings(list(101.3 + rng.normal(0, 0.2, 30)) + [80.0], sensor="pressure")
+        clean_data = ingest_data([temperature, pressure])
+
+        result = detect_anomalies_all(clean_data, method="iqr", threshold=1.5, max_workers=2)
+
+        for sensor in ("temperature", "pressure"):
+            expected = detect_anomalies(clean_data, sensor, method="iqr", threshold=1.5)
+            rows = (clean_data["sensor"] == sensor).to_numpy()
+            np.testing.assert_array_equal(
+                result["anomaly_score"].to_numpy()[rows], expected["anomaly_score"].to_numpy()[rows]
+            )
+        assert (result["detection_method"] == "iqr").all()
+
+    def test_skips_sensors_with_insufficient_data(self):
+        """Sensors too short to score are left unscored instead of failing."""
+        temperature = make_readings([65.0] * 10 + [500.0])
+        pressure = make_readings([101.3], sensor="pressure")
+        result = detect_anomalies_all(ingest_data([temperature, pressure]), threshold=2.0)
+
+        pressure_rows = result[result["sensor"] == "pressure"]
+        assert (pressure_rows["detection_method"] == "none").all()
+        assert result["is_anomaly"].sum() == 1
+
+    def test_other_scoring_errors_propagate(self, monkeypatch):
+        """Only the insufficient-readings case should be skipped silently."""
+        def broken_rolling(values, window):
+            raise ValueError("bug in scoring")
+
+        monkeypatch.setattr("src.data_processing._rolling_zscores", broken_rolling)
+        clean_data = ingest_data([make_readings([65.0] * 10)])
+        with pytest.raises(ValueError, match="bug in scoring"):
+            detect_anomalies_all(clean_data, method="rolling")
+
+    def test_invalid_method_raises_error(self):
+        """Unsupported methods should raise ValueError."""
+        with pytest.raises(ValueError):
+            detect_anomalies_all(ingest_data([make_readings([1.0] * 5)]), method="bogus")
+
+
+class TestSummarizeMetrics:
+    """Tests for summarize_metrics() beyond the exposed suite."""
+
+    def test_quality_and_anomaly_metrics(self):
+        """Quality and anomaly rates should be reported per sensor."""
+        df = make_readings([65.0] * 10 + [500.0, np.nan])
+        df["quality"] = ["GOOD"] * 9 + ["UNCERTAIN"] * 3
+        anomaly_data = detect_anomalies(ingest_data([df]), "temperature", threshold=2.0)
+
+        metrics = summarize_metrics(anomaly_data)["temperature"]
+
+        assert metrics["count"] == 11
+        assert metrics["null_count"] == 1
+        assert metrics["good_quality_pct"] == pytest.approx(75.0)
+        assert metrics["anomaly_rate"] == pytest.approx(1 / 12)
+
+    def test_single_reading_has_zero_std(self):
+        """A group with one reading should report zero spread, not NaN."""
+        metrics = summarize_metrics(ingest_data([make_readings([65.0])]))
+        assert metrics["temperature"]["std"] == 0.0
+
+    def test_time_window_groups_by_window_start(self):
+        """Time windows should nest metrics under each window's start time."""
+        clean_data = ingest_data([make_readings([1.0] * 90 + [2.0] * 30)])
+        metrics = summarize_metrics(clean_data, time_window="1min")
+
+        windows = metrics["temperature"]
+        assert list(windows) == ["2024-01-01T00:00:00", "2024-01-01T00:01:00"]
+        assert windows["2024-01-01T00:01:00"]["count"] == 60
+        assert windows["2024-01-01T00:01:00"]["mean"] == pytest.approx(1.5)